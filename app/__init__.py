@@ -1,3 +0,0 @@
-from .main import app
-
-__all__ = ['app']
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.models.assignments import AssignmentRequest, AssignmentResponse
+from app.models.users import UserDB
+from app.api.dependencies.auth_deps import get_current_user
+from app.db.base_db import get_session
+from app.services.room_assignment import assign_rooms
+import logging
+
+router = APIRouter()
+
+@router.post("/assign-rooms",
+          response_model=AssignmentResponse,
+          summary="Assign rooms to room-type stays",
+          description="Pack a batch of stays booked by room type onto physical rooms. "
+                      "Returns a preview unless `commit` is set, in which case the bookings are created")
+def assign_rooms_endpoint(
+    request: AssignmentRequest,
+    current_user: UserDB = Depends(get_current_user)
+):
+    try:
+        with get_session() as session:
+            return assign_rooms(session, request.stays, request.commit, current_user)
+    except Exception as e:
+        logging.error(f"Error assigning rooms: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to assign rooms"
+        )
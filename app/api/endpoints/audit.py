@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Optional
+from app.models.audit import AuditLogDB, AuditLogPage
+from app.models.users import UserDB
+from app.api.dependencies.auth_deps import get_current_user
+from app.db.base_db import get_session
+from app.services.audit import audit_writer
+import logging
+
+router = APIRouter()
+
+@router.get("/audit-log",
+         response_model=AuditLogPage,
+         summary="Get audit history",
+         description="Audit events newest first, optionally filtered by entity, action or user. "
+                     "Pass the returned next_before_id as before_id to page through older events")
+def get_audit_log(
+    entity_type: Optional[str] = None,
+    entity_id: Optional[int] = None,
+    action: Optional[str] = None,
+    user_id: Optional[int] = None,
+    before_id: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=500),
+    current_user: UserDB = Depends(get_current_user)
+):
+    try:
+        with get_session() as session:
+            query = session.query(AuditLogDB)
+            if entity_type is not None:
+                query = query.filter(AuditLogDB.entity_type == entity_type)
+            if entity_id is not None:
+                query = query.filter(AuditLogDB.entity_id == entity_id)
+            if action is not None:
+                query = query.filter(AuditLogDB.action == action)
+            if user_id is not None:
+                query = query.filter(AuditLogDB.user_id == user_id)
+            if before_id is not None:
+                query = query.filter(AuditLogDB.id < before_id)
+
+            # Fetch one extra row to know whether another page exists
+            rows = query.order_by(AuditLogDB.id.desc()).limit(limit + 1).all()
+            items = rows[:limit]
+            return AuditLogPage(
+                items=items,
+                next_before_id=items[-1].id if len(rows) > limit else None
+            )
+    except Exception as e:
+        logging.error(f"Error retrieving audit log: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve audit log"
+        )
+
+@router.get("/audit-log/metrics",
+         summary="Get audit writer metrics",
+         description="Queue depth and batch write statistics of the audit writer on this worker")
+def get_audit_metrics(current_user: UserDB = Depends(get_current_user)):
+    return audit_writer.get_metrics()
@@ -5,6 +5,9 @@ from app.core.config import settings
 from app.core.security import create_access_token
 from app.models.users import UserDB, UserCreate, UserResponse
 from app.db.base_db import get_session
+from app.services.cache_bus import cache_bus
+from app.services.audit import audit_writer
+from app.models.enums import CacheEvent
 from datetime import datetime
 import logging
 from typing import List
@@ -74,8 +77,10 @@ def register_user(user: UserCreate):
                 updated_at=now
             )
             session.add(db_user)
+            cache_bus.publish(session, CacheEvent.USERS)
             session.commit()
             session.refresh(db_user)
+            audit_writer.record("register", "user", db_user.id, details={"username": db_user.username})
             return db_user
     except HTTPException:
         raise
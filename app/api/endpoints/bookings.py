@@ -1,33 +1,86 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
-from datetime import datetime
-from app.models.bookings import BookingResponse, BookingCreate, BookingDB
-from app.models.rooms import RoomDB
-from app.models.customer import CustomerDB
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from typing import List, Optional
+from datetime import date, datetime
+from app.models.bookings import (
+    BookingResponse, BookingCreate, BookingDB, BookingView, OccupancyGridResponse, EXPANDABLE_RELATIONS
+)
+from app.models.rooms import RoomDB, RoomResponse
+from app.models.customer import CustomerDB, CustomerResponse
 from app.models.users import UserDB
 from app.models.enums import BookingStatus
 from app.api.dependencies.auth_deps import get_current_user
 from app.db.base_db import get_session
+from app.services.pricing import price_stay
+from app.services.idempotency import idempotent_request
+from app.services.occupancy import build_occupancy_grid
+from app.services.audit import audit_writer
 
 router = APIRouter()
 
 
 
+def _parse_list(value: Optional[str], allowed, name: str) -> List[str]:
+    if not value:
+        return []
+    items = [item.strip() for item in value.split(",") if item.strip()]
+    unknown = [item for item in items if item not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown {name}: {', '.join(unknown)}"
+        )
+    return items
+
+def _booking_view(booking: BookingDB, fields: List[str], expand: List[str]) -> BookingView:
+    # Only the requested values are passed, so the rest stay unset and are left out
+    data = {field: getattr(booking, field) for field in fields or BookingResponse.model_fields}
+    if "room" in expand:
+        data["room"] = RoomResponse.model_validate(booking.room) if booking.room else None
+    if "customer" in expand:
+        data["customer"] = CustomerResponse.model_validate(booking.customer) if booking.customer else None
+    return BookingView(**data)
+
 @router.get("/bookings", 
-         response_model=List[BookingResponse],
+         response_model=List[BookingView],
+         response_model_exclude_unset=True,
          summary="Get all bookings",
-         description="Retrieve a list of all bookings")
-def get_bookings(current_user: UserDB = Depends(get_current_user)):
+         description="Retrieve a list of all bookings. Use `fields` to select columns and "
+                     "`expand=room,customer` to embed the related records")
+def get_bookings(
+    fields: Optional[str] = Query(None, description="Comma-separated booking fields to return"),
+    expand: Optional[str] = Query(None, description="Comma-separated relations to embed: room, customer"),
+    current_user: UserDB = Depends(get_current_user)
+):
+    selected_fields = _parse_list(fields, BookingResponse.model_fields, "fields")
+    expansions = _parse_list(expand, EXPANDABLE_RELATIONS, "expand")
     try:
         with get_session() as session:
-            bookings = BookingDB.get_all_bookings(session)
-            return bookings
+            bookings = BookingDB.get_bookings(session, selected_fields, expansions)
+            return [_booking_view(booking, selected_fields, expansions) for booking in bookings]
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve bookings"
         )
 
+@router.get("/bookings/occupancy-grid",
+         response_model=OccupancyGridResponse,
+         summary="Get the occupancy grid",
+         description="Rooms x days occupancy for a date window, run-length encoded per room")
+def get_occupancy_grid(
+    start_date: date,
+    days: int = Query(60, ge=1, le=366),
+    current_user: UserDB = Depends(get_current_user)
+):
+    try:
+        with get_session() as session:
+            return build_occupancy_grid(session, start_date, days)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve occupancy grid"
+        )
+
 @router.post("/create-booking", 
           response_model=BookingResponse,
           status_code=status.HTTP_201_CREATED,
@@ -35,44 +88,80 @@ def get_bookings(current_user: UserDB = Depends(get_current_user)):
           description="Create a new booking with the provided details")
 def create_booking(
     booking: BookingCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     current_user: UserDB = Depends(get_current_user)
 ):
     try:
         with get_session() as session:
-            # Check room availability with proper date parameters
-            if BookingDB.is_room_occupied(
-                session, 
-                booking.room_id, 
-                booking.scheduled_check_in,
-                booking.scheduled_check_out
-            ):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Room is not available for the selected dates"
-                )
+            with idempotent_request(session, f"create-booking:{current_user.id}", idempotency_key, booking) as idempotency:
+                if idempotency.replay is not None:
+                    return idempotency.replay
+
+                # Check room availability with proper date parameters
+                if BookingDB.is_room_occupied(
+                    session, 
+                    booking.room_id, 
+                    booking.scheduled_check_in,
+                    booking.scheduled_check_out
+                ):
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Room is not available for the selected dates"
+                    )
             
-            # Verify room exists
-            room = session.query(RoomDB).filter(RoomDB.id == booking.room_id).first()
-            if not room:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Room not found"
-                )
+                # Verify room exists
+                room = session.query(RoomDB).filter(RoomDB.id == booking.room_id).first()
+                if not room:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail="Room not found"
+                    )
             
-            # Verify customer exists
-            customer = session.query(CustomerDB).filter(CustomerDB.id == booking.customer_id).first()
-            if not customer:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Customer not found"
-                )
+                # Verify customer exists
+                customer = session.query(CustomerDB).filter(CustomerDB.id == booking.customer_id).first()
+                if not customer:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail="Customer not found"
+                    )
                 
-            # Create booking
-            db_booking = BookingDB(**booking.model_dump())
-            session.add(db_booking)
-            session.commit()
-            session.refresh(db_booking)
-            return db_booking
+                booking_data = booking.model_dump()
+                if booking_data["total_amount"] is None:
+                    booking_data["total_amount"] = price_stay(
+                        session,
+                        booking.room_id,
+                        booking.scheduled_check_in,
+                        booking.scheduled_check_out
+                    )
+                    if booking_data["total_amount"] is None:
+                        raise HTTPException(
+                            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            detail="Failed to price the booking"
+                        )
+                    if booking.amount_paid > booking_data["total_amount"]:
+                        raise HTTPException(
+                            status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Amount paid cannot exceed total amount"
+                        )
+
+                # Create booking
+                db_booking = BookingDB(**booking_data)
+                session.add(db_booking)
+                session.flush()
+                session.refresh(db_booking)
+                response = idempotency.save(
+                    session,
+                    status.HTTP_201_CREATED,
+                    BookingResponse.model_validate(db_booking)
+                )
+                # The booking and its stored Idempotency-Key response commit together
+                session.commit()
+                audit_writer.record("create", "booking", db_booking.id, current_user, {
+                    "room_id": db_booking.room_id,
+                    "scheduled_check_in": db_booking.scheduled_check_in.isoformat(),
+                    "scheduled_check_out": db_booking.scheduled_check_out.isoformat()
+                })
+                return response
             
     except HTTPException:
         raise
@@ -82,6 +171,34 @@ def create_booking(
             detail=f"Failed to create booking: {str(e)}"
         )
 
+@router.post("/bookings/{booking_id}/confirm")
+def confirm_booking(
+    booking_id: int,
+    current_user: UserDB = Depends(get_current_user)
+):
+    try:
+        with get_session() as session:
+            booking = session.query(BookingDB).filter(BookingDB.id == booking_id).first()
+            
+            if not booking:
+                raise HTTPException(status_code=404, detail="Booking not found")
+            
+            if booking.booking_status != BookingStatus.PREBOOKED:
+                raise HTTPException(
+                    status_code=400, 
+                    detail="Only prebooked bookings can be confirmed"
+                )
+            
+            booking.booking_status = BookingStatus.CONFIRMED
+            session.commit()
+            audit_writer.record("confirm", "booking", booking_id, current_user)
+            
+            return {"message": "Booking confirmed successfully"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.post("/bookings/{booking_id}/check-in")
 def check_in(
     booking_id: int,
@@ -100,6 +217,7 @@ def check_in(
             booking.actual_check_in = datetime.utcnow()
             booking.booking_status = BookingStatus.CHECKED_IN
             session.commit()
+            audit_writer.record("check_in", "booking", booking_id, current_user)
             
             return {"message": "Check-in successful"}
     except Exception as e:
@@ -126,6 +244,7 @@ def check_out(
             
             booking.booking_status = BookingStatus.CHECKED_OUT
             session.commit()
+            audit_writer.record("check_out", "booking", booking_id, current_user)
             
             return {
                 "message": "Check-out successful",
@@ -146,14 +265,18 @@ def cancel_booking(
             if not booking:
                 raise HTTPException(status_code=404, detail="Booking not found")
             
-            if booking.booking_status not in [BookingStatus.PENDING, BookingStatus.CONFIRMED]:
+            if booking.booking_status not in [BookingStatus.PREBOOKED, BookingStatus.CONFIRMED]:
                 raise HTTPException(
                     status_code=400, 
                     detail="Cannot cancel booking in current status"
                 )
             
+            previous_status = booking.booking_status
             booking.booking_status = BookingStatus.CANCELLED
             session.commit()
+            audit_writer.record("cancel", "booking", booking_id, current_user, {
+                "previous_status": previous_status
+            })
             
             return {"message": "Booking cancelled successfully"}
     except Exception as e:
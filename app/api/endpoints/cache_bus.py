@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Depends
+from app.models.users import UserDB
+from app.api.dependencies.auth_deps import get_current_user
+from app.services.cache_bus import cache_bus
+
+router = APIRouter()
+
+@router.get("/cache-bus/metrics",
+         summary="Get cache invalidation bus metrics",
+         description="Published and received invalidation events and delivery lag on this worker")
+def get_cache_bus_metrics(current_user: UserDB = Depends(get_current_user)):
+    return cache_bus.get_metrics()
@@ -1,9 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from app.models.customer import CustomerResponse, CustomerCreate, CustomerDB
 from app.models.users import UserDB
 from app.api.dependencies.auth_deps import get_current_user
 from app.db.base_db import get_session
+from app.services.idempotency import idempotent_request
+from app.services.cache_bus import cache_bus
+from app.services.audit import audit_writer
+from app.models.enums import CacheEvent
+from app.core.config import settings
+from app.services.object_store import get_object_store
+from app.services.proof_images import (
+    ALLOWED_CONTENT_TYPES, UploadTooLarge, is_stored_filename, proof_image_key, store_proof_image,
+    schedule_thumbnail
+)
+from app.services.multipart_stream import InvalidUpload, MultipartFileStream
+
+# Room for the multipart boundaries and part headers around the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
 
 router = APIRouter()
 
@@ -30,21 +46,174 @@ def get_customers(current_user: UserDB = Depends(get_current_user)):
           description="Create a new customer with the provided details")
 def create_customer(
     customer: CustomerCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     current_user: UserDB = Depends(get_current_user)
 ):
     try:
         with get_session() as session:
-            db_customer = CustomerDB(
-                **customer.model_dump()
-            )
-            session.add(db_customer)
-            session.commit()
-            session.refresh(db_customer)
-            return db_customer
+            with idempotent_request(session, f"create-customer:{current_user.id}", idempotency_key, customer) as idempotency:
+                if idempotency.replay is not None:
+                    return idempotency.replay
+                db_customer = CustomerDB(
+                    **customer.model_dump()
+                )
+                session.add(db_customer)
+                session.flush()
+                session.refresh(db_customer)
+                response = idempotency.save(
+                    session,
+                    status.HTTP_201_CREATED,
+                    CustomerResponse.model_validate(db_customer)
+                )
+                cache_bus.publish(session, CacheEvent.CUSTOMERS)
+                session.commit()
+                audit_writer.record("create", "customer", db_customer.id, current_user)
+                return response
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create customer"
         )
-    
 
+
+def _customer_exists(customer_id: int) -> bool:
+    with get_session() as session:
+        return session.query(CustomerDB.id).filter(CustomerDB.id == customer_id).first() is not None
+
+def _save_proof_image(customer_id: int, store, stored, current_user: UserDB) -> CustomerDB:
+    with get_session() as session:
+        db_customer = session.query(CustomerDB).filter(CustomerDB.id == customer_id).first()
+        db_customer.proof_image_filename = stored.filename
+        db_customer.proof_image_url = (
+            store.url(stored.key)
+            or f"{settings.API_V1_STR}/customers/{customer_id}/proof-image"
+        )
+        cache_bus.publish(session, CacheEvent.CUSTOMERS)
+        session.commit()
+        session.refresh(db_customer)
+        audit_writer.record("upload_proof_image", "customer", customer_id, current_user, {
+            "filename": stored.filename,
+            "size": stored.size,
+            "deduplicated": stored.deduplicated
+        })
+        return db_customer
+
+@router.post("/customers/{customer_id}/proof-image",
+          response_model=CustomerResponse,
+          summary="Upload a proof of identity image",
+          description="Upload a JPEG, PNG, WebP or PDF scan of the customer's ID as the `file` field of a "
+                      "multipart form. The file is streamed to object storage as it arrives and a thumbnail "
+                      "is generated in the background",
+          openapi_extra={
+              "requestBody": {
+                  "required": True,
+                  "content": {
+                      "multipart/form-data": {
+                          "schema": {
+                              "type": "object",
+                              "required": ["file"],
+                              "properties": {"file": {"type": "string", "format": "binary"}}
+                          }
+                      }
+                  }
+              }
+          })
+async def upload_proof_image(
+    customer_id: int,
+    request: Request,
+    current_user: UserDB = Depends(get_current_user)
+):
+    max_body_bytes = settings.MAX_PROOF_IMAGE_BYTES + MULTIPART_OVERHEAD_BYTES
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_body_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds the {settings.MAX_PROOF_IMAGE_BYTES} byte limit"
+        )
+    try:
+        if not await run_in_threadpool(_customer_exists, customer_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Customer not found"
+            )
+
+        # The body is parsed as it arrives, so the size limit applies before it is all received
+        upload = MultipartFileStream(request, "file", max_body_bytes)
+        await upload.read_headers()
+        if upload.content_type not in ALLOWED_CONTENT_TYPES:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail=f"Unsupported file type, expected one of: {', '.join(ALLOWED_CONTENT_TYPES)}"
+            )
+
+        # Stream to storage without holding a database connection for the duration
+        store = get_object_store()
+        stored = await run_in_threadpool(store_proof_image, store, customer_id, upload, upload.content_type)
+        db_customer = await run_in_threadpool(_save_proof_image, customer_id, store, stored, current_user)
+        if not stored.deduplicated:
+            # Submitting may start the spawned worker processes, so keep it off the event loop
+            await run_in_threadpool(schedule_thumbnail, stored.key, upload.content_type)
+        return db_customer
+    except HTTPException:
+        raise
+    except InvalidUpload as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except UploadTooLarge as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to upload proof image"
+        )
+
+@router.get("/customers/{customer_id}/proof-image",
+         summary="Download the proof of identity image",
+         description="Stream the customer's stored proof image from object storage")
+def download_proof_image(
+    customer_id: int,
+    current_user: UserDB = Depends(get_current_user)
+):
+    with get_session() as session:
+        db_customer = session.query(CustomerDB).filter(CustomerDB.id == customer_id).first()
+        # proof_image_filename can also be set through the customer API, so only names
+        # produced by the upload endpoint are turned into storage keys
+        if not db_customer or not is_stored_filename(db_customer.proof_image_filename):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Proof image not found"
+            )
+        key = proof_image_key(customer_id, db_customer.proof_image_filename)
+
+    store = get_object_store()
+    try:
+        found = store.exists(key)
+    except ValueError:
+        found = False
+    if not found:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Proof image not found"
+        )
+    extension = "." + key.rsplit(".", 1)[-1]
+    media_type = next(
+        (content_type for content_type, ext in ALLOWED_CONTENT_TYPES.items() if ext == extension),
+        "application/octet-stream"
+    )
+    source = store.open_read(key)
+
+    def chunks():
+        try:
+            while chunk := source.read(settings.UPLOAD_CHUNK_SIZE):
+                yield chunk
+        finally:
+            source.close()
+
+    return StreamingResponse(chunks(), media_type=media_type)
@@ -0,0 +1,137 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from datetime import date
+from app.models.pricing import (
+    RatePlanDB, RatePlanCreate, RatePlanResponse,
+    PricingRuleDB, PricingRuleCreate, PricingRuleResponse,
+    QuoteResponse
+)
+from app.models.users import UserDB
+from app.api.dependencies.auth_deps import get_current_user
+from app.db.base_db import get_session
+from app.core.config import settings
+from app.services.pricing import quote
+from app.services.cache_bus import cache_bus
+from app.models.enums import CacheEvent
+import logging
+
+router = APIRouter()
+
+@router.get("/rate-plans",
+         response_model=List[RatePlanResponse],
+         summary="Get all rate plans",
+         description="Retrieve all seasonal rate plans ordered by priority")
+def get_rate_plans(current_user: UserDB = Depends(get_current_user)):
+    try:
+        with get_session() as session:
+            return RatePlanDB.get_all_rate_plans(session)
+    except Exception as e:
+        logging.error(f"Error retrieving rate plans: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve rate plans"
+        )
+
+@router.post("/create-rate-plan",
+          response_model=RatePlanResponse,
+          status_code=status.HTTP_201_CREATED,
+          summary="Create a new rate plan",
+          description="Create a seasonal rate plan with weekday and weekend multipliers")
+def create_rate_plan(
+    rate_plan: RatePlanCreate,
+    current_user: UserDB = Depends(get_current_user)
+):
+    try:
+        with get_session() as session:
+            db_rate_plan = RatePlanDB(**rate_plan.model_dump())
+            session.add(db_rate_plan)
+            cache_bus.publish(session, CacheEvent.RATE_TABLES)
+            session.commit()
+            session.refresh(db_rate_plan)
+            return db_rate_plan
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create rate plan"
+        )
+
+@router.get("/pricing-rules",
+         response_model=List[PricingRuleResponse],
+         summary="Get all pricing rules",
+         description="Retrieve all length-of-stay and occupancy pricing rules")
+def get_pricing_rules(current_user: UserDB = Depends(get_current_user)):
+    try:
+        with get_session() as session:
+            return PricingRuleDB.get_all_pricing_rules(session)
+    except Exception as e:
+        logging.error(f"Error retrieving pricing rules: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve pricing rules"
+        )
+
+@router.post("/create-pricing-rule",
+          response_model=PricingRuleResponse,
+          status_code=status.HTTP_201_CREATED,
+          summary="Create a new pricing rule",
+          description="Create a length-of-stay discount or occupancy-based uplift tier")
+def create_pricing_rule(
+    pricing_rule: PricingRuleCreate,
+    current_user: UserDB = Depends(get_current_user)
+):
+    try:
+        with get_session() as session:
+            db_pricing_rule = PricingRuleDB(**pricing_rule.model_dump())
+            session.add(db_pricing_rule)
+            cache_bus.publish(session, CacheEvent.RATE_TABLES)
+            session.commit()
+            session.refresh(db_pricing_rule)
+            return db_pricing_rule
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create pricing rule"
+        )
+
+@router.get("/quote",
+         response_model=QuoteResponse,
+         summary="Quote a stay",
+         description="Price every available room (optionally of one type) for the given dates")
+def get_quote(
+    check_in: date,
+    check_out: date,
+    room_type: Optional[str] = None,
+    include_unavailable: bool = False,
+    current_user: UserDB = Depends(get_current_user)
+):
+    if check_out <= check_in:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Check-out date must be after check-in date"
+        )
+    if (check_out - check_in).days > settings.MAX_QUOTE_NIGHTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Stays longer than {settings.MAX_QUOTE_NIGHTS} nights cannot be quoted"
+        )
+    try:
+        with get_session() as session:
+            rooms = quote(
+                session,
+                check_in,
+                check_out,
+                room_type=room_type,
+                include_unavailable=include_unavailable
+            )
+            return QuoteResponse(
+                check_in=check_in,
+                check_out=check_out,
+                nights=(check_out - check_in).days,
+                rooms=rooms
+            )
+    except Exception as e:
+        logging.error(f"Error quoting stay: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to quote stay"
+        )
@@ -4,6 +4,8 @@ from app.models.rooms import RoomResponse, RoomCreate, RoomDB
 from app.models.users import UserDB
 from app.api.dependencies.auth_deps import get_current_user
 from app.db.base_db import get_session
+from app.services.cache_bus import cache_bus
+from app.models.enums import CacheEvent
 import logging
 from app.core.config import settings
 
@@ -33,6 +35,7 @@ def create_room(
         with get_session() as session:
             db_room = RoomDB(**room.model_dump())
             session.add(db_room)
+            cache_bus.publish(session, CacheEvent.ROOMS)
             session.commit()
             session.refresh(db_room)
             return db_room
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends
+from app.models.users import UserDB
+from app.api.dependencies.auth_deps import get_current_user
+from app.services.scheduler import scheduler
+
+router = APIRouter()
+
+@router.get("/scheduler/metrics",
+         summary="Get scheduler metrics",
+         description="Per-job run counts, affected rows and timings of the background scheduler on this worker")
+def get_scheduler_metrics(current_user: UserDB = Depends(get_current_user)):
+    return {
+        "is_leader": scheduler.is_leader,
+        "interval_seconds": scheduler.interval_seconds,
+        "jobs": scheduler.get_metrics()
+    }
@@ -1,9 +1,14 @@
 from fastapi import APIRouter
-from app.api.endpoints import auth, bookings, customers, rooms
+from app.api.endpoints import assignments, audit, auth, bookings, cache_bus, customers, pricing, rooms, scheduler
 
 api_router = APIRouter()
 
 api_router.include_router(auth.router, tags=["authentication"])
 api_router.include_router(bookings.router, tags=["bookings"])
+api_router.include_router(assignments.router, tags=["assignments"])
 api_router.include_router(customers.router, tags=["customers"])
-api_router.include_router(rooms.router, tags=["rooms"]) 
\ No newline at end of file
+api_router.include_router(pricing.router, tags=["pricing"])
+api_router.include_router(rooms.router, tags=["rooms"])
+api_router.include_router(scheduler.router, tags=["scheduler"])
+api_router.include_router(cache_bus.router, tags=["cache"])
+api_router.include_router(audit.router, tags=["audit"]) 
\ No newline at end of file
@@ -7,6 +7,45 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
+    # Background scheduler
+    SCHEDULER_ENABLED: bool = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+    SCHEDULER_INTERVAL_SECONDS: int = int(os.getenv("SCHEDULER_INTERVAL_SECONDS", "300"))
+    SCHEDULER_BATCH_SIZE: int = int(os.getenv("SCHEDULER_BATCH_SIZE", "500"))
+    NO_SHOW_GRACE_DAYS: int = int(os.getenv("NO_SHOW_GRACE_DAYS", "1"))
+    PREBOOKING_EXPIRE_HOURS: int = int(os.getenv("PREBOOKING_EXPIRE_HOURS", "48"))
+    LATE_CHECKOUT_RATE_MULTIPLIER: float = float(os.getenv("LATE_CHECKOUT_RATE_MULTIPLIER", "1.0"))
+
+    # Pricing
+    RATE_TABLE_CACHE_SECONDS: int = int(os.getenv("RATE_TABLE_CACHE_SECONDS", "300"))
+    # Quotes build a rooms x nights matrix, so the stay length is capped
+    MAX_QUOTE_NIGHTS: int = int(os.getenv("MAX_QUOTE_NIGHTS", "366"))
+
+    # Idempotency keys
+    IDEMPOTENCY_KEY_TTL_HOURS: int = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+    # How long a retry waits for the original request before answering 409
+    IDEMPOTENCY_LOCK_TIMEOUT_MS: int = int(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT_MS", "5000"))
+
+    # Cross-worker cache invalidation
+    CACHE_BUS_ENABLED: bool = os.getenv("CACHE_BUS_ENABLED", "true").lower() == "true"
+    CACHE_BUS_CHANNEL: str = os.getenv("CACHE_BUS_CHANNEL", "cache_invalidation")
+
+    # Audit log
+    AUDIT_QUEUE_SIZE: int = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+    AUDIT_BATCH_SIZE: int = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", "1.0"))
+    AUDIT_ENQUEUE_TIMEOUT_SECONDS: float = float(os.getenv("AUDIT_ENQUEUE_TIMEOUT_SECONDS", "0.05"))
+
+    # Object storage and proof image uploads
+    OBJECT_STORE_BACKEND: str = os.getenv("OBJECT_STORE_BACKEND", "local")  # "local" or "s3"
+    OBJECT_STORE_ROOT: str = os.getenv("OBJECT_STORE_ROOT", "./storage")
+    OBJECT_STORE_BUCKET: str = os.getenv("OBJECT_STORE_BUCKET", "hotel-management")
+    OBJECT_STORE_ENDPOINT_URL: str = os.getenv("OBJECT_STORE_ENDPOINT_URL", "")
+    OBJECT_STORE_PUBLIC_URL: str = os.getenv("OBJECT_STORE_PUBLIC_URL", "")
+    MAX_PROOF_IMAGE_BYTES: int = int(os.getenv("MAX_PROOF_IMAGE_BYTES", str(20 * 1024 * 1024)))
+    UPLOAD_CHUNK_SIZE: int = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+    THUMBNAIL_SIZE: int = int(os.getenv("THUMBNAIL_SIZE", "256"))
+    THUMBNAIL_WORKERS: int = int(os.getenv("THUMBNAIL_WORKERS", "2"))
+
     class Config:
         env_file = ".env"
 
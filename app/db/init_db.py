@@ -1,3 +1,4 @@
+from sqlalchemy import text
 from app.models.base import Base
 from app.db.base_db import engine
 
@@ -6,6 +7,33 @@ from app.models.rooms import RoomDB
 from app.models.bookings import BookingDB
 from app.models.customer import CustomerDB
 from app.models.users import UserDB
+from app.models.pricing import RatePlanDB, PricingRuleDB
+from app.models.idempotency import IdempotencyKeyDB
+from app.models.audit import AuditLogDB
+
+def _upgrade_bookings(connection):
+    """
+    Bring a bookings table created by an older version up to date. create_all never
+    alters existing tables, and ALTER/CREATE INDEX lock the table even when there is
+    nothing to do, so check the catalog first and only change what is missing.
+    """
+    has_late_checkout_charge = connection.execute(text(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name = 'bookings' "
+        "AND column_name = 'late_checkout_charge'"
+    )).first()
+    if not has_late_checkout_charge:
+        connection.execute(text(
+            "ALTER TABLE bookings ADD COLUMN IF NOT EXISTS "
+            "late_checkout_charge NUMERIC(10, 2) NOT NULL DEFAULT 0"
+        ))
+
+    for index in BookingDB.__table__.indexes:
+        if index.name == "ix_bookings_active_room_dates":
+            # checkfirst looks the index up in the catalog before issuing CREATE INDEX
+            index.create(bind=connection, checkfirst=True)
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        _upgrade_bookings(connection)
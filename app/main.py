@@ -2,6 +2,10 @@ from fastapi import FastAPI
 from app.core.config import settings
 from app.db.init_db import init_db
 from app.api.routes import api_router
+from app.services.scheduler import scheduler
+from app.services.cache_bus import cache_bus
+from app.services.audit import audit_writer
+from app.services.proof_images import shutdown_thumbnail_pool
 
 app = FastAPI(
     title="RS Residency API",
@@ -17,6 +21,21 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 # Initialize database tables
 init_db()
 
+@app.on_event("startup")
+def start_background_jobs():
+    audit_writer.start()
+    if settings.CACHE_BUS_ENABLED:
+        cache_bus.start()
+    if settings.SCHEDULER_ENABLED:
+        scheduler.start()
+
+@app.on_event("shutdown")
+def stop_background_jobs():
+    scheduler.stop()
+    cache_bus.stop()
+    shutdown_thumbnail_pool()
+    audit_writer.stop()
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to RS Residency!"} 
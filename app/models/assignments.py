@@ -0,0 +1,64 @@
+from datetime import date
+from pydantic import BaseModel, field_validator
+from typing import List, Optional
+from app.models.enums import BookingStatus
+
+class StayRequest(BaseModel):
+    room_type: str
+    guests: int
+    customer_id: int
+    scheduled_check_in: date
+    scheduled_check_out: date
+    reference: Optional[str] = None  # Caller's own id, e.g. OTA reservation number
+    notes: Optional[str] = None
+    # Prebooked stays are cancelled by the scheduler unless confirmed in time
+    booking_status: BookingStatus = BookingStatus.CONFIRMED
+
+    @field_validator('booking_status')
+    @classmethod
+    def booking_status_validation(cls, v):
+        if v not in (BookingStatus.PREBOOKED, BookingStatus.CONFIRMED):
+            raise ValueError("Assigned stays can only be prebooked or confirmed")
+        return v
+
+    @field_validator('guests')
+    @classmethod
+    def guests_validation(cls, v):
+        if v < 1:
+            raise ValueError("A stay must have at least one guest")
+        return v
+
+    @field_validator('scheduled_check_in')
+    @classmethod
+    def check_in_date_validation(cls, v):
+        if v < date.today():
+            raise ValueError("Check-in date cannot be in the past")
+        return v
+
+    @field_validator('scheduled_check_out')
+    @classmethod
+    def check_out_date_validation(cls, v, info):
+        check_in = info.data.get('scheduled_check_in')
+        if check_in and v <= check_in:
+            raise ValueError("Check-out date must be after check-in date")
+        return v
+
+class AssignmentRequest(BaseModel):
+    stays: List[StayRequest]
+    commit: bool = False  # Preview only unless set; when set, bookings are created
+
+class RoomAssignment(BaseModel):
+    index: int  # Position of the stay in the request
+    reference: Optional[str]
+    room_id: int
+    booking_id: Optional[int] = None
+    total_amount: Optional[float] = None
+
+class UnassignedStay(BaseModel):
+    index: int
+    reference: Optional[str]
+    reason: str
+
+class AssignmentResponse(BaseModel):
+    assigned: List[RoomAssignment]
+    unassigned: List[UnassignedStay]
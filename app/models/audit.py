@@ -0,0 +1,37 @@
+from datetime import datetime
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, JSON, Index
+from app.models.base import Base
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+
+class AuditLogDB(Base):
+    __tablename__ = "audit_log"
+    __table_args__ = (
+        Index("ix_audit_log_entity", "entity_type", "entity_id", "id"),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    occurred_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    user_id = Column(Integer, nullable=True)      # NULL for system actions
+    username = Column(String(100), nullable=True)
+    action = Column(String(50), nullable=False)   # e.g. "check_in", "cancel"
+    entity_type = Column(String(50), nullable=False)
+    entity_id = Column(Integer, nullable=True)
+    details = Column(JSON, nullable=True)
+
+class AuditLogResponse(BaseModel):
+    id: int
+    occurred_at: datetime
+    user_id: Optional[int]
+    username: Optional[str]
+    action: str
+    entity_type: str
+    entity_id: Optional[int]
+    details: Optional[Dict[str, Any]]
+
+    class Config:
+        from_attributes = True
+
+class AuditLogPage(BaseModel):
+    items: List[AuditLogResponse]
+    next_before_id: Optional[int]  # Pass as before_id to fetch the next (older) page
@@ -1,13 +1,33 @@
 from datetime import datetime, date, timedelta
-from sqlalchemy import Column, Integer, ForeignKey, Date, DateTime, String, Numeric
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, ForeignKey, Date, DateTime, String, Numeric, Index, text
+from sqlalchemy.orm import relationship, load_only, selectinload
 from app.models.base import Base
 from pydantic import BaseModel, field_validator
 from app.models.enums import BookingStatus, PaymentStatus
-from typing import List, Optional
+from app.models.rooms import RoomResponse
+from app.models.customer import CustomerResponse
+from typing import List, Optional, Sequence
+
+# Statuses that hold a room for their dates
+ACTIVE_BOOKING_STATUSES = [
+    BookingStatus.CHECKED_IN.value,
+    BookingStatus.CONFIRMED.value,
+    BookingStatus.PREBOOKED.value
+]
+
+# Relationships that can be embedded in booking queries
+EXPANDABLE_RELATIONS = ("room", "customer")
 
 class BookingDB(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        # Only active bookings block a room, so keep the availability index to those rows
+        Index(
+            "ix_bookings_active_room_dates",
+            "room_id", "scheduled_check_in", "scheduled_check_out",
+            postgresql_where=text("booking_status IN ('prebooked', 'confirmed', 'checked_in')")
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     room_id = Column(Integer, ForeignKey("rooms.id"))
@@ -29,6 +49,7 @@ class BookingDB(Base):
     
     # Additional charges (for late check-out etc.)
     additional_charges = Column(Numeric(10, 2), default=0)
+    late_checkout_charge = Column(Numeric(10, 2), default=0, nullable=False)  # Share of additional_charges for overstays
     notes = Column(String, nullable=True)
     
     booking_date = Column(DateTime, default=datetime.utcnow)
@@ -51,11 +72,7 @@ class BookingDB(Base):
         """
         return session.query(cls).filter(
             cls.room_id == room_id,
-            cls.booking_status.in_([
-                BookingStatus.CHECKED_IN.value, 
-                BookingStatus.CONFIRMED.value, 
-                BookingStatus.PREBOOKED.value
-            ]),
+            cls.booking_status.in_(ACTIVE_BOOKING_STATUSES),
             # Check if there's any overlap with existing bookings
             cls.scheduled_check_in < check_out_date,
             cls.scheduled_check_out > check_in_date
@@ -65,6 +82,26 @@ class BookingDB(Base):
     def get_all_bookings(cls, session):
         return session.query(cls).all()
 
+    @classmethod
+    def get_bookings(cls, session, fields: Optional[Sequence[str]] = None, expand: Sequence[str] = ()):
+        """
+        Query bookings selecting only the requested columns, with each expanded
+        relationship loaded in one batched SELECT ... IN instead of per row
+        Args:
+            session: Database session
+            fields: Column names to load (all columns when omitted)
+            expand: Names from EXPANDABLE_RELATIONS to eager load
+        """
+        query = session.query(cls)
+        if fields:
+            columns = set(fields)
+            # The foreign keys are needed to batch-load the related rows
+            columns.update(f"{name}_id" for name in expand)
+            query = query.options(load_only(*[getattr(cls, column) for column in columns]))
+        for name in expand:
+            query = query.options(selectinload(getattr(cls, name)))
+        return query.order_by(cls.id).all()
+
 class BookingCreate(BaseModel):
     room_id: int
     customer_id: int
@@ -72,7 +109,7 @@ class BookingCreate(BaseModel):
     scheduled_check_out: date
     payment_status: PaymentStatus
     booking_status: BookingStatus
-    total_amount: float
+    total_amount: Optional[float] = None  # Priced by the rate engine when omitted
     amount_paid: float
     additional_charges: float
     notes: Optional[str]
@@ -97,14 +134,14 @@ class BookingCreate(BaseModel):
     def amount_paid_validation(cls, v, info):
         if v < 0:
             raise ValueError("Amount paid cannot be negative")
-        if 'total_amount' in info.data and v > info.data['total_amount']:
+        if info.data.get('total_amount') is not None and v > info.data['total_amount']:
             raise ValueError("Amount paid cannot exceed total amount")
         return v
 
     @field_validator('total_amount')
     @classmethod
     def total_amount_validation(cls, v):
-        if v <= 0:
+        if v is not None and v <= 0:
             raise ValueError("Total amount must be greater than zero")
         return v
 
@@ -125,4 +162,38 @@ class BookingResponse(BaseModel):
     booking_date: datetime
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+class BookingView(BookingResponse):
+    """
+    Booking returned by GET /bookings. Only the selected fields and expanded
+    relations are set, and the endpoint leaves unset ones out of the response.
+    """
+    id: Optional[int] = None
+    room_id: Optional[int] = None
+    customer_id: Optional[int] = None
+    scheduled_check_in: Optional[date] = None
+    scheduled_check_out: Optional[date] = None
+    actual_check_in: Optional[datetime] = None
+    actual_check_out: Optional[datetime] = None
+    booking_status: Optional[str] = None
+    payment_status: Optional[str] = None
+    total_amount: Optional[float] = None
+    amount_paid: Optional[float] = None
+    additional_charges: Optional[float] = None
+    notes: Optional[str] = None
+    booking_date: Optional[datetime] = None
+    room: Optional[RoomResponse] = None
+    customer: Optional[CustomerResponse] = None
+
+class OccupancyGridRoom(BaseModel):
+    id: int
+    name: str
+    # One [start_offset, length, booking_id, status_index] entry per booking, in days from start_date
+    runs: List[List[int]]
+
+class OccupancyGridResponse(BaseModel):
+    start_date: date
+    days: int
+    statuses: List[str]  # Legend for status_index in each run
+    rooms: List[OccupancyGridRoom]
@@ -14,4 +14,12 @@ class PaymentStatus(str, Enum):
     PAID = "paid"
     REFUNDED = "refunded" 
 
+class PricingRuleType(str, Enum):
+    LENGTH_OF_STAY = "length_of_stay"  # threshold is the minimum number of nights
+    OCCUPANCY = "occupancy"            # threshold is the minimum occupancy ratio (0-1)
 
+class CacheEvent(str, Enum):
+    ROOMS = "rooms"
+    RATE_TABLES = "rate_tables"
+    CUSTOMERS = "customers"
+    USERS = "users"
@@ -0,0 +1,14 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from app.models.base import Base
+
+class IdempotencyKeyDB(Base):
+    __tablename__ = "idempotency_keys"
+
+    scope = Column(String(100), primary_key=True)   # Endpoint and user the key belongs to
+    key = Column(String(255), primary_key=True)     # Client supplied Idempotency-Key header
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=False)
+    response_body = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
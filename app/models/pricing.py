@@ -0,0 +1,116 @@
+from datetime import date, datetime
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime
+from app.models.base import Base
+from pydantic import BaseModel, field_validator
+from app.models.enums import PricingRuleType
+from typing import List, Optional
+
+class RatePlanDB(Base):
+    __tablename__ = "rate_plans"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(100), nullable=False)
+    room_type = Column(String(50), nullable=True)    # NULL applies to every room type
+    start_date = Column(Date, nullable=False)        # First night covered
+    end_date = Column(Date, nullable=False)          # Last night covered (inclusive)
+    weekday_multiplier = Column(Float, nullable=False, default=1.0)
+    weekend_multiplier = Column(Float, nullable=False, default=1.0)
+    priority = Column(Integer, nullable=False, default=0)  # Higher priority wins on overlap
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    @classmethod
+    def get_all_rate_plans(cls, session):
+        return session.query(cls).order_by(cls.priority, cls.id).all()
+
+class PricingRuleDB(Base):
+    __tablename__ = "pricing_rules"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    rule_type = Column(String(20), nullable=False)
+    threshold = Column(Float, nullable=False)
+    adjustment_percent = Column(Float, nullable=False)  # Negative for discounts
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    @classmethod
+    def get_all_pricing_rules(cls, session):
+        return session.query(cls).order_by(cls.rule_type, cls.threshold).all()
+
+class RatePlanBase(BaseModel):
+    name: str
+    room_type: Optional[str] = None
+    start_date: date
+    end_date: date
+    weekday_multiplier: float = 1.0
+    weekend_multiplier: float = 1.0
+    priority: int = 0
+
+    class Config:
+        from_attributes = True
+
+    @field_validator('end_date')
+    @classmethod
+    def end_date_validation(cls, v, info):
+        start = info.data.get('start_date')
+        if start and v < start:
+            raise ValueError("End date cannot be before start date")
+        return v
+
+    @field_validator('weekday_multiplier', 'weekend_multiplier')
+    @classmethod
+    def multiplier_validation(cls, v):
+        if v <= 0:
+            raise ValueError("Multipliers must be greater than zero")
+        return v
+
+class RatePlanCreate(RatePlanBase):
+    pass
+
+class RatePlanResponse(RatePlanBase):
+    id: int
+
+class PricingRuleBase(BaseModel):
+    rule_type: PricingRuleType
+    threshold: float
+    adjustment_percent: float
+
+    class Config:
+        from_attributes = True
+
+    @field_validator('threshold')
+    @classmethod
+    def threshold_validation(cls, v, info):
+        if v < 0:
+            raise ValueError("Threshold cannot be negative")
+        if info.data.get('rule_type') == PricingRuleType.OCCUPANCY and v > 1:
+            raise ValueError("Occupancy threshold must be a ratio between 0 and 1")
+        return v
+
+    @field_validator('adjustment_percent')
+    @classmethod
+    def adjustment_validation(cls, v):
+        if v <= -100:
+            raise ValueError("Adjustment cannot discount 100% or more")
+        return v
+
+class PricingRuleCreate(PricingRuleBase):
+    pass
+
+class PricingRuleResponse(PricingRuleBase):
+    id: int
+
+class RoomQuote(BaseModel):
+    room_id: int
+    room_name: str
+    room_type: str
+    capacity: int
+    available: bool
+    nightly_rates: List[float]
+    subtotal: float
+    length_of_stay_adjustment: float
+    total: float
+
+class QuoteResponse(BaseModel):
+    check_in: date
+    check_out: date
+    nights: int
+    rooms: List[RoomQuote]
@@ -0,0 +1,175 @@
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from app.core.config import settings
+from app.db.base_db import get_session
+from app.models.audit import AuditLogDB
+
+logger = logging.getLogger(__name__)
+
+# Queued by stop() to wake the writer and make it drain what is left
+_SHUTDOWN = object()
+
+# Upper bound for the wait between attempts to write a batch while the database is failing
+MAX_RETRY_DELAY_SECONDS = 30.0
+
+
+@dataclass
+class AuditMetrics:
+    enqueued: int = 0
+    written: int = 0
+    dropped: int = 0
+    failed: int = 0
+    retries: int = 0
+    batches: int = 0
+    last_batch_size: int = 0
+    last_flush_ms: float = 0.0
+
+
+class AuditWriter:
+    """
+    Collects audit events from request handlers and writes them in batches.
+
+    record() only puts the event on a bounded in-process queue; a background thread
+    inserts queued events with one multi-row INSERT once the batch is full or the
+    flush interval has passed. When the queue is full, record() blocks for at most
+    the enqueue timeout and then drops the event, so a slow database never stalls
+    the API for long.
+
+    A batch that fails to write is kept and retried with exponential backoff, and
+    new events are added to it meanwhile. Once it holds as many events as the queue
+    does, the writer stops taking more, the queue fills up and record() starts
+    dropping; events are only lost for good when that bound is reached or the
+    database is still down at shutdown.
+    """
+
+    def __init__(self, max_queue_size: int, batch_size: int, flush_interval: float, enqueue_timeout: float):
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.metrics = AuditMetrics()
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._pending = 0
+
+    def record(
+        self,
+        action: str,
+        entity_type: str,
+        entity_id: Optional[int] = None,
+        user=None,
+        details: Optional[Dict[str, Any]] = None
+    ):
+        event = {
+            "occurred_at": datetime.utcnow(),
+            "user_id": user.id if user is not None else None,
+            "username": user.username if user is not None else None,
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "details": details,
+        }
+        try:
+            self._queue.put(event, timeout=self.enqueue_timeout)
+            self.metrics.enqueued += 1
+        except queue.Full:
+            self.metrics.dropped += 1
+            logger.warning(f"Audit queue full, dropped {action} event for {entity_type} {entity_id}")
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Flush everything still queued, then stop the writer thread"""
+        if not self._thread or not self._thread.is_alive():
+            return
+        deadline = time.monotonic() + timeout
+        self._stopping.set()
+        # While the queue is full the writer is either draining it or, with the database
+        # down, holding back; in that case it notices _stopping and exits on its own
+        while self._thread.is_alive() and time.monotonic() < deadline:
+            try:
+                self._queue.put(_SHUTDOWN, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+        self._thread.join(max(deadline - time.monotonic(), 0))
+
+    def get_metrics(self) -> dict:
+        metrics = asdict(self.metrics)
+        metrics["queued"] = self._queue.qsize()
+        metrics["pending"] = self._pending
+        return metrics
+
+    def _run(self):
+        batch: List[dict] = []
+        deadline = time.monotonic() + self.flush_interval
+        retry_delay = 0.0  # Non-zero while the last write failed
+        while True:
+            timeout = max(deadline - time.monotonic(), 0)
+            if len(batch) < self.max_queue_size:
+                try:
+                    event = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    event = None
+            else:
+                # Leave new events in the queue so record() applies the bound
+                event = _SHUTDOWN if self._stopping.wait(timeout) else None
+
+            if event is _SHUTDOWN:
+                if not self._flush(batch):
+                    self.metrics.failed += len(batch)
+                self._pending = 0
+                return
+            if event is not None:
+                batch.append(event)
+            self._pending = len(batch)
+            batch_full = len(batch) >= self.batch_size and not retry_delay
+            if batch_full or time.monotonic() >= deadline:
+                if self._flush(batch):
+                    batch = []
+                    self._pending = 0
+                    retry_delay = 0.0
+                    deadline = time.monotonic() + self.flush_interval
+                else:
+                    self.metrics.retries += 1
+                    retry_delay = min(max(retry_delay * 2, self.flush_interval), MAX_RETRY_DELAY_SECONDS)
+                    deadline = time.monotonic() + retry_delay
+
+    def _flush(self, batch: List[dict]) -> bool:
+        if not batch:
+            return True
+        started = time.perf_counter()
+        try:
+            with get_session() as session:
+                # A list of parameter sets is sent as batched multi-row INSERTs
+                session.execute(insert(AuditLogDB), batch)
+                session.commit()
+            self.metrics.written += len(batch)
+            self.metrics.batches += 1
+            self.metrics.last_batch_size = len(batch)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} audit events, will retry: {str(e)}")
+            return False
+        finally:
+            self.metrics.last_flush_ms = (time.perf_counter() - started) * 1000
+
+audit_writer = AuditWriter(
+    max_queue_size=settings.AUDIT_QUEUE_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+    enqueue_timeout=settings.AUDIT_ENQUEUE_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,172 @@
+import json
+import logging
+import select
+import threading
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import event, text
+from app.core.config import settings
+from app.db.base_db import engine
+from app.models.enums import CacheEvent
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_INITIAL_DELAY = 1.0
+RECONNECT_MAX_DELAY = 30.0
+POLL_TIMEOUT_SECONDS = 5.0
+
+
+@dataclass
+class BusMetrics:
+    published: int = 0
+    received: int = 0
+    dispatch_errors: int = 0
+    reconnects: int = 0
+    connected: bool = False
+    last_lag_ms: float = 0.0
+    max_lag_ms: float = 0.0
+    total_lag_ms: float = 0.0
+
+    @property
+    def avg_lag_ms(self) -> float:
+        return self.total_lag_ms / self.received if self.received else 0.0
+
+
+class CacheInvalidationBus:
+    """
+    Broadcasts cache invalidation events to every worker over Postgres LISTEN/NOTIFY.
+
+    publish() queues a NOTIFY inside the caller's transaction, so other workers only
+    hear about a change once it has been committed. Each worker runs a listener
+    thread that calls the callbacks subscribed to the event type.
+    """
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self.metrics = BusMetrics()
+        self._subscribers: Dict[CacheEvent, List[Callable]] = defaultdict(list)
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._connection = None
+
+    def subscribe(self, cache_event: CacheEvent, callback: Callable):
+        self._subscribers[cache_event].append(callback)
+
+    def publish(self, session, cache_event: CacheEvent):
+        """Queue an invalidation on the session's transaction; delivered on commit"""
+        payload = json.dumps({
+            "event": cache_event.value,
+            "origin": self.origin,
+            "sent_at": time.time(),
+        })
+        session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": self.channel, "payload": payload}
+        )
+        # This worker sees its own change immediately instead of waiting for the round trip
+        event.listen(session, "after_commit", lambda _: self._dispatch(cache_event), once=True)
+        self.metrics.published += 1
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._listen_loop, name="cache-invalidation-bus", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self._close_connection()
+
+    def get_metrics(self) -> dict:
+        metrics = asdict(self.metrics)
+        metrics["avg_lag_ms"] = self.metrics.avg_lag_ms
+        return metrics
+
+    def _dispatch(self, cache_event: CacheEvent):
+        for callback in self._subscribers.get(cache_event, []):
+            try:
+                callback()
+            except Exception as e:
+                self.metrics.dispatch_errors += 1
+                logger.error(f"Cache invalidation callback for {cache_event.value} failed: {str(e)}")
+
+    def _invalidate_all(self):
+        for cache_event in list(self._subscribers):
+            self._dispatch(cache_event)
+
+    def _connect(self):
+        raw = engine.raw_connection()
+        # Keep the listening connection out of the pool for the lifetime of the thread
+        raw.detach()
+        connection = raw.driver_connection
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+        self._connection = connection
+        self.metrics.connected = True
+
+    def _close_connection(self):
+        self.metrics.connected = False
+        if self._connection is None:
+            return
+        try:
+            self._connection.close()
+        except Exception:
+            pass
+        self._connection = None
+
+    def _handle_notification(self, notification):
+        try:
+            payload = json.loads(notification.payload)
+            cache_event = CacheEvent(payload["event"])
+        except (ValueError, KeyError) as e:
+            logger.error(f"Ignoring malformed cache invalidation payload: {str(e)}")
+            return
+
+        lag_ms = max((time.time() - payload.get("sent_at", time.time())) * 1000, 0.0)
+        self.metrics.received += 1
+        self.metrics.last_lag_ms = lag_ms
+        self.metrics.total_lag_ms += lag_ms
+        self.metrics.max_lag_ms = max(self.metrics.max_lag_ms, lag_ms)
+
+        if payload.get("origin") != self.origin:
+            self._dispatch(cache_event)
+
+    def _listen_loop(self):
+        delay = RECONNECT_INITIAL_DELAY
+        while not self._stop_event.is_set():
+            try:
+                if self._connection is None:
+                    self._connect()
+                    # Anything published while we were disconnected was missed
+                    self._invalidate_all()
+                    delay = RECONNECT_INITIAL_DELAY
+
+                readable, _, _ = select.select([self._connection], [], [], POLL_TIMEOUT_SECONDS)
+                if readable:
+                    self._connection.poll()
+                else:
+                    # Quiet channel; make sure the connection is still alive. Notifications
+                    # that arrive during the query are read into notifies along with its
+                    # result, so they are handled below rather than waking select() again
+                    with self._connection.cursor() as cursor:
+                        cursor.execute("SELECT 1")
+                while self._connection.notifies:
+                    self._handle_notification(self._connection.notifies.pop(0))
+            except Exception as e:
+                logger.warning(f"Cache invalidation bus disconnected: {str(e)}")
+                self._close_connection()
+                self.metrics.reconnects += 1
+                self._stop_event.wait(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+
+cache_bus = CacheInvalidationBus(settings.CACHE_BUS_CHANNEL)
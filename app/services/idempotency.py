@@ -0,0 +1,130 @@
+import hashlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.models.idempotency import IdempotencyKeyDB
+
+# First half of the two-key advisory lock, so idempotency locks never collide with other users
+IDEMPOTENCY_LOCK_NAMESPACE = 0x52530002
+
+# SQLSTATE raised when lock_timeout expires
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+class IdempotentRequest:
+    """
+    Handle for one request inside idempotent_request().
+
+    `replay` holds the stored response when the key was already used; otherwise the
+    handler runs as usual and passes its result to save() before committing.
+    """
+
+    def __init__(self, scope: str, key: Optional[str], request_hash: str):
+        self.scope = scope
+        self.key = key
+        self.request_hash = request_hash
+        self.replay: Optional[JSONResponse] = None
+
+    def save(self, session, status_code: int, response: BaseModel) -> BaseModel:
+        """Stage the response on the handler's session; it is committed with the created row"""
+        if self.key is None:
+            return response
+        now = datetime.utcnow()
+        values = {
+            "scope": self.scope,
+            "key": self.key,
+            "request_hash": self.request_hash,
+            "status_code": status_code,
+            "response_body": response.model_dump(mode="json"),
+            "created_at": now,
+            "expires_at": now + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS),
+        }
+        statement = insert(IdempotencyKeyDB).values(**values)
+        # An expired row for the same key may still be around until the purge job runs
+        statement = statement.on_conflict_do_update(
+            index_elements=[IdempotencyKeyDB.scope, IdempotencyKeyDB.key],
+            set_={name: value for name, value in values.items() if name not in ("scope", "key")}
+        )
+        session.execute(statement)
+        return response
+
+
+@contextmanager
+def idempotent_request(session, scope: str, key: Optional[str], payload: BaseModel):
+    """
+    Make a create endpoint safe to retry with an Idempotency-Key header.
+
+    Takes a transaction-level advisory lock on the handler's own session, so the
+    created row and the stored response commit together and the lock is released
+    by that same commit (or the rollback on error). A concurrent retry waits at most
+    IDEMPOTENCY_LOCK_TIMEOUT_MS for the first request, then replays its response.
+    """
+    if key is not None and len(key) > IdempotencyKeyDB.key.type.length:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Idempotency-Key must be at most {IdempotencyKeyDB.key.type.length} characters"
+        )
+    request_hash = hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+    request = IdempotentRequest(scope, key, request_hash)
+    if key is None:
+        yield request
+        return
+
+    previous_timeout = session.execute(text("SELECT current_setting('lock_timeout')")).scalar()
+    session.execute(
+        text("SELECT set_config('lock_timeout', :timeout, true)"),
+        {"timeout": f"{settings.IDEMPOTENCY_LOCK_TIMEOUT_MS}ms"}
+    )
+    try:
+        session.execute(
+            text("SELECT pg_advisory_xact_lock(:namespace, hashtext(:name))"),
+            {"namespace": IDEMPOTENCY_LOCK_NAMESPACE, "name": f"{scope}:{key}"}
+        )
+    except OperationalError as e:
+        session.rollback()
+        if getattr(e.orig, "pgcode", None) == LOCK_NOT_AVAILABLE:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress"
+            )
+        raise
+    # Only the lock wait is bounded; the handler's own statements keep the usual timeout
+    session.execute(
+        text("SELECT set_config('lock_timeout', :timeout, true)"),
+        {"timeout": previous_timeout}
+    )
+
+    stored = session.execute(
+        select(
+            IdempotencyKeyDB.request_hash,
+            IdempotencyKeyDB.status_code,
+            IdempotencyKeyDB.response_body
+        ).where(
+            IdempotencyKeyDB.scope == scope,
+            IdempotencyKeyDB.key == key,
+            IdempotencyKeyDB.expires_at > datetime.utcnow()
+        )
+    ).first()
+    if stored is not None:
+        # Nothing to write; end the transaction to release the lock
+        session.rollback()
+        if stored.request_hash != request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used with a different request"
+            )
+        request.replay = JSONResponse(
+            status_code=stored.status_code,
+            content=stored.response_body,
+            headers={"Idempotent-Replayed": "true"}
+        )
+    yield request
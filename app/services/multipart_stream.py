@@ -0,0 +1,138 @@
+from typing import Dict, List, Optional
+
+import anyio.from_thread
+from starlette.requests import Request
+
+from app.services.proof_images import UploadTooLarge
+
+# Same fallback as Starlette: the package was renamed from multipart to python_multipart
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ModuleNotFoundError:
+    from multipart.multipart import MultipartParser, parse_options_header
+
+
+class InvalidUpload(Exception):
+    pass
+
+
+class MultipartFileStream:
+    """
+    Reads one file field of a multipart/form-data request while the body is arriving.
+
+    The request stream is fed to python-multipart's push parser on demand, so only
+    the chunk being parsed is in memory. read_headers() runs on the event loop and
+    stops once the file part's headers are known; read() is then called from a
+    worker thread and pulls the part's data through the event loop piece by piece.
+    Raises UploadTooLarge once more than `max_body_bytes` of the body has been received.
+    """
+
+    def __init__(self, request: Request, field_name: str, max_body_bytes: int):
+        content_type, params = parse_options_header(request.headers.get("content-type", ""))
+        if content_type != b"multipart/form-data" or not params.get(b"boundary"):
+            raise InvalidUpload("Expected a multipart/form-data request")
+
+        self.field_name = field_name.encode()
+        self.max_body_bytes = max_body_bytes
+        self.content_type: Optional[str] = None
+        self.filename: Optional[str] = None
+
+        self._body = request.stream().__aiter__()
+        self._received = 0
+        self._body_done = False
+        self._headers_ready = False
+        self._part_done = False
+        self._in_field = False
+        self._pieces: List[bytes] = []
+        self._buffer = bytearray()
+        self._part_headers: Dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._parser = MultipartParser(params[b"boundary"], {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+
+    def _on_part_begin(self):
+        self._part_headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._part_headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._part_headers.get(b"content-disposition", b""))
+        if self._headers_ready or options.get(b"name") != self.field_name:
+            return
+        self._in_field = True
+        self._headers_ready = True
+        self.content_type = self._part_headers.get(b"content-type", b"").decode("latin-1")
+        filename = options.get(b"filename")
+        self.filename = filename.decode("utf-8", "replace") if filename else None
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        if self._in_field:
+            self._pieces.append(bytes(data[start:end]))
+
+    def _on_part_end(self):
+        if self._in_field:
+            self._in_field = False
+            self._part_done = True
+
+    async def _feed(self):
+        try:
+            chunk = await self._body.__anext__()
+        except StopAsyncIteration:
+            self._body_done = True
+            self._parser.finalize()
+            return
+        self._received += len(chunk)
+        if self._received > self.max_body_bytes:
+            raise UploadTooLarge(f"Request body exceeds the {self.max_body_bytes} byte limit")
+        try:
+            self._parser.write(chunk)
+        except ValueError as e:
+            raise InvalidUpload(f"Malformed multipart body: {str(e)}")
+
+    async def read_headers(self):
+        """Parse the body up to the headers of the file field"""
+        while not self._headers_ready and not self._body_done:
+            await self._feed()
+        if not self._headers_ready:
+            raise InvalidUpload(f"Missing form field: {self.field_name.decode()}")
+
+    async def _next_data(self) -> bytes:
+        """Next parsed piece of the file field, or b"" once the field has ended"""
+        while True:
+            data = b"".join(self._pieces)
+            self._pieces = []
+            if data or self._part_done:
+                return data
+            if self._body_done:
+                raise InvalidUpload("Request body ended inside the file field")
+            await self._feed()
+
+    def read(self, size: int = -1) -> bytes:
+        """Blocking read for worker threads started with run_in_threadpool"""
+        while size < 0 or len(self._buffer) < size:
+            data = anyio.from_thread.run(self._next_data)
+            if not data:
+                break
+            self._buffer += data
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
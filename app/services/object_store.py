@@ -0,0 +1,149 @@
+import io
+import os
+import shutil
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import BinaryIO, Iterable, Optional
+
+from app.core.config import settings
+
+
+class ObjectStore(ABC):
+    """Minimal blob storage interface used for uploaded files"""
+
+    @abstractmethod
+    def write_stream(self, key: str, chunks: Iterable[bytes]):
+        """Write the object from an iterable of chunks without holding it all in memory"""
+
+    @abstractmethod
+    def open_read(self, key: str) -> BinaryIO:
+        pass
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    def move(self, source_key: str, target_key: str):
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+    def url(self, key: str) -> Optional[str]:
+        """Public URL of the object, or None when it is only reachable through the API"""
+        if settings.OBJECT_STORE_PUBLIC_URL:
+            return f"{settings.OBJECT_STORE_PUBLIC_URL.rstrip('/')}/{key}"
+        return None
+
+
+class LocalObjectStore(ObjectStore):
+    """Stores objects as files below a root directory"""
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+
+    def _path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, key))
+        if not path.startswith(self.root + os.sep):
+            raise ValueError(f"Invalid object key: {key}")
+        return path
+
+    def write_stream(self, key: str, chunks: Iterable[bytes]):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+
+    def open_read(self, key: str) -> BinaryIO:
+        return open(self._path(key), "rb")
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def move(self, source_key: str, target_key: str):
+        target = self._path(target_key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.move(self._path(source_key), target)
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class _ChunkReader(io.RawIOBase):
+    """File-like view over an iterable of chunks, for APIs that read from a file object"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            try:
+                self._pending = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+class S3ObjectStore(ObjectStore):
+    """S3-compatible storage (AWS, MinIO, ...); requires the optional boto3 package"""
+
+    def __init__(self, bucket: str, endpoint_url: Optional[str] = None):
+        try:
+            import boto3
+        except ImportError:
+            raise RuntimeError("The s3 object store backend requires boto3 to be installed")
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+
+    def write_stream(self, key: str, chunks: Iterable[bytes]):
+        # upload_fileobj switches to a multipart upload with bounded buffers for large files
+        self.client.upload_fileobj(_ChunkReader(chunks), self.bucket, key)
+
+    def open_read(self, key: str) -> BinaryIO:
+        return self.client.get_object(Bucket=self.bucket, Key=key)["Body"]
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def move(self, source_key: str, target_key: str):
+        self.client.copy({"Bucket": self.bucket, "Key": source_key}, self.bucket, target_key)
+        self.delete(source_key)
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def url(self, key: str) -> Optional[str]:
+        public_url = super().url(key)
+        if public_url or not self.endpoint_url:
+            return public_url
+        return f"{self.endpoint_url.rstrip('/')}/{self.bucket}/{key}"
+
+
+@lru_cache(maxsize=1)
+def get_object_store() -> ObjectStore:
+    if settings.OBJECT_STORE_BACKEND == "local":
+        return LocalObjectStore(settings.OBJECT_STORE_ROOT)
+    if settings.OBJECT_STORE_BACKEND == "s3":
+        return S3ObjectStore(settings.OBJECT_STORE_BUCKET, settings.OBJECT_STORE_ENDPOINT_URL or None)
+    raise RuntimeError(f"Unknown object store backend: {settings.OBJECT_STORE_BACKEND}")
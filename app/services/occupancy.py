@@ -0,0 +1,57 @@
+from datetime import date, timedelta
+from sqlalchemy import and_
+from app.models.bookings import BookingDB, OccupancyGridRoom, OccupancyGridResponse
+from app.models.rooms import RoomDB
+from app.models.enums import BookingStatus
+
+# Statuses drawn on the calendar; a run's status_index points into this list
+GRID_STATUSES = [
+    BookingStatus.PREBOOKED.value,
+    BookingStatus.CONFIRMED.value,
+    BookingStatus.CHECKED_IN.value,
+    BookingStatus.CHECKED_OUT.value,
+]
+
+
+def build_occupancy_grid(session, start_date: date, days: int) -> OccupancyGridResponse:
+    """
+    Build the rooms x days calendar from a single query: every room, outer joined to
+    the bookings overlapping the window. Each booking becomes one run-length entry,
+    clipped to the window, instead of one cell per day.
+    """
+    end_date = start_date + timedelta(days=days)
+    status_index = {status: i for i, status in enumerate(GRID_STATUSES)}
+
+    rows = session.query(
+        RoomDB.id,
+        RoomDB.name,
+        BookingDB.id.label("booking_id"),
+        BookingDB.scheduled_check_in,
+        BookingDB.scheduled_check_out,
+        BookingDB.booking_status
+    ).outerjoin(
+        BookingDB,
+        and_(
+            BookingDB.room_id == RoomDB.id,
+            BookingDB.booking_status.in_(GRID_STATUSES),
+            BookingDB.scheduled_check_in < end_date,
+            BookingDB.scheduled_check_out > start_date
+        )
+    ).order_by(RoomDB.id, BookingDB.scheduled_check_in).all()
+
+    rooms = []
+    for row in rows:
+        if not rooms or rooms[-1].id != row.id:
+            rooms.append(OccupancyGridRoom(id=row.id, name=row.name, runs=[]))
+        if row.booking_id is None:
+            continue
+        first = max((row.scheduled_check_in - start_date).days, 0)
+        last = min((row.scheduled_check_out - start_date).days, days)
+        rooms[-1].runs.append([first, last - first, row.booking_id, status_index[row.booking_status]])
+
+    return OccupancyGridResponse(
+        start_date=start_date,
+        days=days,
+        statuses=GRID_STATUSES,
+        rooms=rooms
+    )
@@ -0,0 +1,271 @@
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.models.bookings import BookingDB, ACTIVE_BOOKING_STATUSES
+from app.models.rooms import RoomDB
+from app.models.pricing import RatePlanDB, PricingRuleDB, RoomQuote
+from app.models.enums import PricingRuleType, CacheEvent
+from app.services.cache_bus import cache_bus
+
+# Nights starting on Friday and Saturday are priced as weekend nights (Monday == 0)
+WEEKEND_NIGHTS = (4, 5)
+
+
+@dataclass
+class _RatePlan:
+    start: np.datetime64
+    end: np.datetime64
+    room_mask: np.ndarray
+    weekday_multiplier: float
+    weekend_multiplier: float
+
+
+@dataclass
+class RateTables:
+    """Room catalog and pricing rules flattened into arrays, one slot per room"""
+    room_ids: np.ndarray
+    room_names: List[str]
+    room_types: np.ndarray
+    capacities: np.ndarray
+    base_prices: np.ndarray
+    plans: List[_RatePlan]
+    los_thresholds: np.ndarray
+    los_adjustments: np.ndarray
+    occupancy_thresholds: np.ndarray
+    occupancy_adjustments: np.ndarray
+
+
+def _tiers(rules, rule_type: PricingRuleType):
+    selected = sorted(
+        (rule.threshold, rule.adjustment_percent)
+        for rule in rules if rule.rule_type == rule_type.value
+    )
+    thresholds = np.array([t for t, _ in selected], dtype=np.float64)
+    adjustments = np.array([a for _, a in selected], dtype=np.float64)
+    return thresholds, adjustments
+
+
+def _tier_lookup(thresholds: np.ndarray, adjustments: np.ndarray, values) -> np.ndarray:
+    """Adjustment percent of the highest tier whose threshold is <= each value (0 when none)"""
+    values = np.asarray(values, dtype=np.float64)
+    if thresholds.size == 0:
+        return np.zeros_like(values)
+    idx = np.searchsorted(thresholds, values, side="right") - 1
+    return np.where(idx >= 0, adjustments[np.maximum(idx, 0)], 0.0)
+
+
+def load_rate_tables(session) -> RateTables:
+    rooms = session.query(
+        RoomDB.id, RoomDB.name, RoomDB.room_type, RoomDB.capacity, RoomDB.price_per_night
+    ).order_by(RoomDB.id).all()
+    room_types = np.array([room.room_type for room in rooms], dtype=object)
+
+    plans = []
+    for plan in RatePlanDB.get_all_rate_plans(session):
+        if plan.room_type is None:
+            room_mask = np.ones(len(rooms), dtype=bool)
+        else:
+            room_mask = room_types == plan.room_type
+        plans.append(_RatePlan(
+            start=np.datetime64(plan.start_date, "D"),
+            end=np.datetime64(plan.end_date, "D"),
+            room_mask=room_mask,
+            weekday_multiplier=plan.weekday_multiplier,
+            weekend_multiplier=plan.weekend_multiplier,
+        ))
+
+    rules = PricingRuleDB.get_all_pricing_rules(session)
+    los_thresholds, los_adjustments = _tiers(rules, PricingRuleType.LENGTH_OF_STAY)
+    occupancy_thresholds, occupancy_adjustments = _tiers(rules, PricingRuleType.OCCUPANCY)
+
+    return RateTables(
+        room_ids=np.array([room.id for room in rooms], dtype=np.int64),
+        room_names=[room.name for room in rooms],
+        room_types=room_types,
+        capacities=np.array([room.capacity for room in rooms], dtype=np.int64),
+        base_prices=np.array([room.price_per_night for room in rooms], dtype=np.float64),
+        plans=plans,
+        los_thresholds=los_thresholds,
+        los_adjustments=los_adjustments,
+        occupancy_thresholds=occupancy_thresholds,
+        occupancy_adjustments=occupancy_adjustments,
+    )
+
+
+class RateTableCache:
+    """Process-local cache of RateTables, refreshed after a TTL or on invalidate()"""
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._tables: Optional[RateTables] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, session, refresh: bool = False) -> RateTables:
+        with self._lock:
+            if refresh or self._tables is None or time.monotonic() - self._loaded_at > self.ttl_seconds:
+                self._tables = load_rate_tables(session)
+                self._loaded_at = time.monotonic()
+            return self._tables
+
+    def invalidate(self):
+        with self._lock:
+            self._tables = None
+
+
+rate_table_cache = RateTableCache(settings.RATE_TABLE_CACHE_SECONDS)
+cache_bus.subscribe(CacheEvent.ROOMS, rate_table_cache.invalidate)
+cache_bus.subscribe(CacheEvent.RATE_TABLES, rate_table_cache.invalidate)
+
+
+def _occupied_nights(session, tables: RateTables, check_in: date, check_out: date, nights: int):
+    """
+    Fetch every active booking overlapping the window in a single query and return
+    the number of occupied rooms per night plus a mask of rooms that are taken.
+    """
+    rows = session.query(
+        BookingDB.room_id, BookingDB.scheduled_check_in, BookingDB.scheduled_check_out
+    ).filter(
+        BookingDB.booking_status.in_(ACTIVE_BOOKING_STATUSES),
+        BookingDB.scheduled_check_in < check_out,
+        BookingDB.scheduled_check_out > check_in
+    ).all()
+    if not rows:
+        return np.zeros(nights, dtype=np.int64), np.zeros(tables.room_ids.size, dtype=bool)
+
+    window_start = np.datetime64(check_in, "D")
+    starts = np.array([row.scheduled_check_in for row in rows], dtype="datetime64[D]")
+    ends = np.array([row.scheduled_check_out for row in rows], dtype="datetime64[D]")
+    start_idx = np.clip((starts - window_start).astype(np.int64), 0, nights)
+    end_idx = np.clip((ends - window_start).astype(np.int64), 0, nights)
+
+    # Difference array: +1 on the first occupied night, -1 after the last one
+    diff = np.zeros(nights + 1, dtype=np.int64)
+    np.add.at(diff, start_idx, 1)
+    np.add.at(diff, end_idx, -1)
+    occupied = np.cumsum(diff)[:nights]
+
+    booked = np.isin(tables.room_ids, np.array([row.room_id for row in rows], dtype=np.int64))
+    return occupied, booked
+
+
+def _nightly_rates(tables: RateTables, rows: np.ndarray, dates: np.ndarray, occupied: np.ndarray) -> np.ndarray:
+    """Rooms x nights matrix: base price x rate plan multiplier x occupancy uplift"""
+    # Rate plan multipliers, applied in priority order so higher priorities overwrite
+    day_of_week = (dates.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+    weekend = np.isin(day_of_week, WEEKEND_NIGHTS)
+    multipliers = np.ones((rows.size, dates.size), dtype=np.float64)
+    for plan in tables.plans:
+        in_season = (dates >= plan.start) & (dates <= plan.end)
+        applies = plan.room_mask[rows][:, None] & in_season[None, :]
+        if not applies.any():
+            continue
+        plan_rates = np.where(weekend, plan.weekend_multiplier, plan.weekday_multiplier)
+        multipliers = np.where(applies, plan_rates[None, :], multipliers)
+
+    occupancy = occupied / max(tables.room_ids.size, 1)
+    uplift = 1 + _tier_lookup(tables.occupancy_thresholds, tables.occupancy_adjustments, occupancy) / 100
+
+    return np.round(tables.base_prices[rows][:, None] * multipliers * uplift[None, :], 2)
+
+
+def _apply_length_of_stay(tables: RateTables, subtotals: np.ndarray, nights):
+    los_percent = _tier_lookup(tables.los_thresholds, tables.los_adjustments, nights)
+    adjustments = np.round(subtotals * los_percent / 100, 2)
+    return adjustments, np.round(subtotals + adjustments, 2)
+
+
+def quote(
+    session,
+    check_in: date,
+    check_out: date,
+    room_type: Optional[str] = None,
+    room_ids: Optional[List[int]] = None,
+    include_unavailable: bool = False
+) -> List[RoomQuote]:
+    """
+    Price every matching room for the stay. All nightly rates are computed at once
+    as a rooms x nights matrix, followed by the length-of-stay adjustment on each
+    room's subtotal.
+    """
+    tables = rate_table_cache.get(session)
+    nights = (check_out - check_in).days
+    dates = np.arange(np.datetime64(check_in, "D"), np.datetime64(check_out, "D"))
+
+    occupied, booked = _occupied_nights(session, tables, check_in, check_out, nights)
+
+    selected = np.ones(tables.room_ids.size, dtype=bool)
+    if room_type is not None:
+        selected &= tables.room_types == room_type
+    if room_ids is not None:
+        selected &= np.isin(tables.room_ids, np.array(room_ids, dtype=np.int64))
+    if not include_unavailable:
+        selected &= ~booked
+    rows = np.flatnonzero(selected)
+
+    nightly = _nightly_rates(tables, rows, dates, occupied)
+    subtotals = np.round(nightly.sum(axis=1), 2)
+    los_adjustments, totals = _apply_length_of_stay(tables, subtotals, nights)
+
+    return [
+        RoomQuote(
+            room_id=int(tables.room_ids[row]),
+            room_name=tables.room_names[row],
+            room_type=tables.room_types[row],
+            capacity=int(tables.capacities[row]),
+            available=not bool(booked[row]),
+            nightly_rates=nightly[i].tolist(),
+            subtotal=float(subtotals[i]),
+            length_of_stay_adjustment=float(los_adjustments[i]),
+            total=float(totals[i]),
+        )
+        for i, row in enumerate(rows)
+    ]
+
+
+def price_stays(session, stays: List[Tuple[int, date, date]]) -> List[Optional[float]]:
+    """
+    Total price for each (room_id, check_in, check_out) stay, or None for unknown rooms.
+    The whole batch shares one occupancy query and one nightly rate matrix spanning
+    every stay; each stay's subtotal is read off a cumulative sum of its room's row.
+    """
+    if not stays:
+        return []
+    tables = rate_table_cache.get(session)
+    if not set(room_id for room_id, _, _ in stays).issubset(tables.room_ids.tolist()):
+        # A room created on another worker may not have reached this cache yet
+        tables = rate_table_cache.get(session, refresh=True)
+    if tables.room_ids.size == 0:
+        return [None] * len(stays)
+    window_start = min(check_in for _, check_in, _ in stays)
+    window_end = max(check_out for _, _, check_out in stays)
+    window_nights = (window_end - window_start).days
+    dates = np.arange(np.datetime64(window_start, "D"), np.datetime64(window_end, "D"))
+    occupied, _ = _occupied_nights(session, tables, window_start, window_end, window_nights)
+
+    row_of_room = {int(room_id): row for row, room_id in enumerate(tables.room_ids)}
+    known = np.array([room_id in row_of_room for room_id, _, _ in stays], dtype=bool)
+    rows, stay_rows = np.unique(
+        np.array([row_of_room.get(room_id, 0) for room_id, _, _ in stays], dtype=np.int64),
+        return_inverse=True
+    )
+
+    nightly = _nightly_rates(tables, rows, dates, occupied)
+    cumulative = np.concatenate([np.zeros((rows.size, 1)), np.cumsum(nightly, axis=1)], axis=1)
+    starts = np.array([(check_in - window_start).days for _, check_in, _ in stays], dtype=np.int64)
+    ends = np.array([(check_out - window_start).days for _, _, check_out in stays], dtype=np.int64)
+    subtotals = np.round(cumulative[stay_rows, ends] - cumulative[stay_rows, starts], 2)
+    _, totals = _apply_length_of_stay(tables, subtotals, ends - starts)
+
+    return [float(total) if ok else None for total, ok in zip(totals, known)]
+
+
+def price_stay(session, room_id: int, check_in: date, check_out: date) -> Optional[float]:
+    """Total price of a single room for the stay, or None if the room does not exist"""
+    return price_stays(session, [(room_id, check_in, check_out)])[0]
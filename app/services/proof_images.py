@@ -0,0 +1,171 @@
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import closing
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, Optional
+
+from app.core.config import settings
+from app.services.object_store import ObjectStore, get_object_store
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_CONTENT_TYPES = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "application/pdf": ".pdf",
+}
+THUMBNAIL_CONTENT_TYPES = {"image/jpeg", "image/png", "image/webp"}
+# Names given to stored files by store_proof_image: sha256 of the content plus extension
+STORED_FILENAME_PATTERN = re.compile(
+    r"[0-9a-f]{64}(" + "|".join(re.escape(ext) for ext in ALLOWED_CONTENT_TYPES.values()) + r")"
+)
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+@dataclass
+class StoredProofImage:
+    key: str
+    filename: str
+    sha256: str
+    size: int
+    deduplicated: bool
+
+
+def proof_image_key(customer_id: int, filename: str) -> str:
+    # Same layout as CustomerDB.proof_image_key
+    return f"customer_proofs/{customer_id}/{filename}"
+
+
+def is_stored_filename(filename: Optional[str]) -> bool:
+    return bool(filename) and STORED_FILENAME_PATTERN.fullmatch(filename) is not None
+
+
+def thumbnail_key(key: str) -> str:
+    directory, filename = key.rsplit("/", 1)
+    return f"{directory}/thumbnails/{os.path.splitext(filename)[0]}.jpg"
+
+
+def _hashed_chunks(source: BinaryIO, digest, chunk_size: int, max_bytes: int, counter: list) -> Iterator[bytes]:
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            return
+        counter[0] += len(chunk)
+        if counter[0] > max_bytes:
+            raise UploadTooLarge(f"File exceeds the {max_bytes} byte limit")
+        digest.update(chunk)
+        yield chunk
+
+
+def store_proof_image(store: ObjectStore, customer_id: int, source: BinaryIO, content_type: str) -> StoredProofImage:
+    """
+    Copy an uploaded file into the object store chunk by chunk, hashing as it goes.
+
+    The file is written under a temporary key first because its final, content-
+    addressed name is only known once the last chunk has been hashed; uploading
+    the same file again for a customer reuses the stored object.
+    """
+    digest = hashlib.sha256()
+    counter = [0]
+    temp_key = f"uploads/tmp/{uuid.uuid4().hex}"
+    try:
+        store.write_stream(
+            temp_key,
+            _hashed_chunks(source, digest, settings.UPLOAD_CHUNK_SIZE, settings.MAX_PROOF_IMAGE_BYTES, counter)
+        )
+    except Exception:
+        store.delete(temp_key)
+        raise
+
+    sha256 = digest.hexdigest()
+    filename = f"{sha256}{ALLOWED_CONTENT_TYPES[content_type]}"
+    key = proof_image_key(customer_id, filename)
+    deduplicated = store.exists(key)
+    if deduplicated:
+        store.delete(temp_key)
+    else:
+        store.move(temp_key, key)
+    return StoredProofImage(key=key, filename=filename, sha256=sha256, size=counter[0], deduplicated=deduplicated)
+
+
+def generate_thumbnail(key: str, size: int) -> str:
+    """Runs in a worker process; reads the image from the object store and writes a JPEG thumbnail"""
+    from PIL import Image
+
+    store = get_object_store()
+    with closing(store.open_read(key)) as source:
+        image = Image.open(source)
+        image.thumbnail((size, size))
+        output = io.BytesIO()
+        image.convert("RGB").save(output, format="JPEG", quality=85)
+    target = thumbnail_key(key)
+    store.write_stream(target, [output.getvalue()])
+    return target
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _log_thumbnail_result(future):
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Thumbnail generation failed: {str(error)}")
+
+
+def schedule_thumbnail(key: str, content_type: str):
+    """
+    Queue thumbnail generation in the process pool; returns immediately.
+
+    Never raises: the upload has already been saved, and a missing thumbnail
+    should not turn it into an error.
+    """
+    global _executor
+    if content_type not in THUMBNAIL_CONTENT_TYPES:
+        return
+    with _executor_lock:
+        future = None
+        for _ in range(2):
+            try:
+                if _executor is None:
+                    # Forking a process that runs the event loop, the DB pool and other threads is unsafe
+                    _executor = ProcessPoolExecutor(
+                        max_workers=settings.THUMBNAIL_WORKERS,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                future = _executor.submit(generate_thumbnail, key, settings.THUMBNAIL_SIZE)
+                break
+            except BrokenProcessPool:
+                # A worker died or failed to start; a broken pool never recovers, so replace it
+                logger.warning("Thumbnail pool is broken, starting a new one")
+                _executor.shutdown(wait=False, cancel_futures=True)
+                _executor = None
+            except Exception as e:
+                logger.error(f"Failed to schedule thumbnail for {key}: {str(e)}")
+                return
+    if future is None:
+        logger.error(f"Failed to schedule thumbnail for {key}: thumbnail pool keeps breaking")
+        return
+    future.add_done_callback(_log_thumbnail_result)
+
+
+def shutdown_thumbnail_pool():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
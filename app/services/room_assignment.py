@@ -0,0 +1,209 @@
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from app.models.assignments import StayRequest, RoomAssignment, UnassignedStay, AssignmentResponse
+from app.models.bookings import BookingDB, ACTIVE_BOOKING_STATUSES
+from app.models.customer import CustomerDB
+from app.models.rooms import RoomDB
+from app.models.enums import PaymentStatus
+from app.services.pricing import price_stays
+from app.services.audit import audit_writer
+
+# Score for a side of the stay with no neighbouring booking; any real gap is preferred
+OPEN_GAP_DAYS = 100_000
+
+
+class _RoomSchedule:
+    """Sorted, non-overlapping [start, end) day-ordinal intervals already taken in one room"""
+
+    __slots__ = ("room_id", "capacity", "starts", "ends")
+
+    def __init__(self, room_id: int, capacity: int, intervals: List[Tuple[int, int]]):
+        self.room_id = room_id
+        self.capacity = capacity
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        for start, end in sorted(intervals):
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def gaps(self, start: int, end: int) -> Optional[Tuple[int, int]]:
+        """Free days left before and after the stay, or None if it overlaps a booking"""
+        i = bisect_right(self.starts, start)
+        if i and self.ends[i - 1] > start:
+            return None
+        if i < len(self.starts) and self.starts[i] < end:
+            return None
+        before = start - self.ends[i - 1] if i else OPEN_GAP_DAYS
+        after = self.starts[i] - end if i < len(self.starts) else OPEN_GAP_DAYS
+        return before, after
+
+    def add(self, start: int, end: int):
+        i = bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+
+
+def pack_stays(
+    stays: List[StayRequest],
+    rooms: List[Tuple[int, str, int]],
+    occupied: Dict[int, List[Tuple[int, int]]]
+) -> Tuple[Dict[int, int], Dict[int, str]]:
+    """
+    Best-fit interval packing of stays onto rooms.
+
+    Stays are placed in check-in order (longest first on ties). Each goes to the
+    room of its type with enough capacity where it leaves the smallest unsellable
+    gap to the neighbouring bookings, so untouched rooms stay fully open for later
+    stays. Returns {stay index: room id} and {stay index: reason} for the rest.
+    """
+    schedules_by_type: Dict[str, List[_RoomSchedule]] = defaultdict(list)
+    for room_id, room_type, capacity in rooms:
+        schedules_by_type[room_type].append(_RoomSchedule(room_id, capacity, occupied.get(room_id, [])))
+    for schedules in schedules_by_type.values():
+        # Smallest rooms first, so the first perfect fit found is also the tightest
+        schedules.sort(key=lambda schedule: (schedule.capacity, schedule.room_id))
+
+    order = sorted(
+        range(len(stays)),
+        key=lambda i: (
+            stays[i].scheduled_check_in,
+            stays[i].scheduled_check_in - stays[i].scheduled_check_out
+        )
+    )
+
+    assigned: Dict[int, int] = {}
+    reasons: Dict[int, str] = {}
+    for i in order:
+        stay = stays[i]
+        candidates = [
+            schedule for schedule in schedules_by_type.get(stay.room_type, [])
+            if schedule.capacity >= stay.guests
+        ]
+        if not candidates:
+            if stay.room_type not in schedules_by_type:
+                reasons[i] = f"No rooms of type {stay.room_type}"
+            else:
+                reasons[i] = f"No {stay.room_type} room fits {stay.guests} guests"
+            continue
+
+        start = stay.scheduled_check_in.toordinal()
+        end = stay.scheduled_check_out.toordinal()
+        best = None
+        best_score = None
+        for schedule in candidates:
+            gaps = schedule.gaps(start, end)
+            if gaps is None:
+                continue
+            score = (gaps[0] + gaps[1], schedule.capacity, schedule.room_id)
+            if best_score is None or score < best_score:
+                best, best_score = schedule, score
+                if score[0] == 0:
+                    break
+
+        if best is None:
+            reasons[i] = f"No {stay.room_type} room free for the selected dates"
+            continue
+        best.add(start, end)
+        assigned[i] = best.room_id
+
+    return assigned, reasons
+
+
+def assign_rooms(session, stays: List[StayRequest], commit: bool, user=None) -> AssignmentResponse:
+    """
+    Assign physical rooms to a batch of room-type stays, optionally creating the
+    bookings. Rooms, customers and existing bookings are each read with one query.
+    """
+    if not stays:
+        return AssignmentResponse(assigned=[], unassigned=[])
+
+    room_query = session.query(RoomDB.id, RoomDB.room_type, RoomDB.capacity).filter(
+        RoomDB.room_type.in_({stay.room_type for stay in stays})
+    )
+    if commit:
+        # Serialise concurrent assignment runs over the same rooms
+        room_query = room_query.with_for_update()
+    rooms = room_query.order_by(RoomDB.id).all()
+
+    customer_ids = {
+        customer_id for (customer_id,) in session.query(CustomerDB.id).filter(
+            CustomerDB.id.in_({stay.customer_id for stay in stays})
+        )
+    }
+
+    occupied: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+    if rooms:
+        window_start = min(stay.scheduled_check_in for stay in stays)
+        window_end = max(stay.scheduled_check_out for stay in stays)
+        existing = session.query(
+            BookingDB.room_id, BookingDB.scheduled_check_in, BookingDB.scheduled_check_out
+        ).filter(
+            BookingDB.room_id.in_([room.id for room in rooms]),
+            BookingDB.booking_status.in_(ACTIVE_BOOKING_STATUSES),
+            BookingDB.scheduled_check_in < window_end,
+            BookingDB.scheduled_check_out > window_start
+        )
+        for room_id, check_in, check_out in existing:
+            occupied[room_id].append((check_in.toordinal(), check_out.toordinal()))
+
+    valid = [i for i, stay in enumerate(stays) if stay.customer_id in customer_ids]
+    assigned, reasons = pack_stays([stays[i] for i in valid], rooms, occupied)
+    assigned = {valid[i]: room_id for i, room_id in assigned.items()}
+    reasons = {valid[i]: reason for i, reason in reasons.items()}
+    for i, stay in enumerate(stays):
+        if stay.customer_id not in customer_ids:
+            reasons[i] = "Customer not found"
+
+    indexes = sorted(assigned)
+    totals = price_stays(session, [
+        (assigned[i], stays[i].scheduled_check_in, stays[i].scheduled_check_out) for i in indexes
+    ])
+
+    booking_ids: Dict[int, int] = {}
+    if commit and indexes:
+        bookings = [
+            BookingDB(
+                room_id=assigned[i],
+                customer_id=stays[i].customer_id,
+                scheduled_check_in=stays[i].scheduled_check_in,
+                scheduled_check_out=stays[i].scheduled_check_out,
+                booking_status=stays[i].booking_status.value,
+                payment_status=PaymentStatus.PENDING.value,
+                total_amount=total,
+                amount_paid=0,
+                additional_charges=0,
+                notes=stays[i].notes
+            )
+            for i, total in zip(indexes, totals)
+        ]
+        session.add_all(bookings)
+        session.flush()
+        booking_ids = {i: booking.id for i, booking in zip(indexes, bookings)}
+        session.commit()
+        for i in indexes:
+            audit_writer.record("assign", "booking", booking_ids[i], user, {
+                "room_id": assigned[i],
+                "reference": stays[i].reference
+            })
+
+    return AssignmentResponse(
+        assigned=[
+            RoomAssignment(
+                index=i,
+                reference=stays[i].reference,
+                room_id=assigned[i],
+                booking_id=booking_ids.get(i),
+                total_amount=total
+            )
+            for i, total in zip(indexes, totals)
+        ],
+        unassigned=[
+            UnassignedStay(index=i, reference=stays[i].reference, reason=reasons[i])
+            for i in sorted(reasons)
+        ]
+    )
@@ -0,0 +1,279 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime, date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import Date, Numeric, cast, select, update, delete, literal, text, tuple_
+from app.core.config import settings
+from app.db.base_db import engine, get_session
+from app.models.bookings import BookingDB
+from app.models.rooms import RoomDB
+from app.models.idempotency import IdempotencyKeyDB
+from app.models.enums import BookingStatus
+from app.services.audit import audit_writer
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary but fixed key shared by every worker; whoever holds it runs the jobs
+SCHEDULER_LOCK_KEY = 0x52530001
+
+
+@dataclass
+class JobMetrics:
+    runs: int = 0
+    failures: int = 0
+    rows_affected_total: int = 0
+    last_rows_affected: int = 0
+    last_duration_ms: float = 0.0
+    last_run_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+
+
+def _run_batched(
+    session,
+    build_statement: Callable,
+    batch_size: int,
+    audit_action: Optional[str] = None,
+    audit_details: Optional[Callable[[Any], Dict[str, Any]]] = None
+) -> int:
+    """
+    Execute a set-based UPDATE/DELETE repeatedly until it touches fewer rows than the batch size.
+    Each batch is committed on its own so row locks are held only briefly.
+
+    With audit_action, the statement must return the booking id first (RETURNING); every
+    affected booking is then recorded in the audit log as a system action once its batch
+    has committed.
+    """
+    total = 0
+    while True:
+        result = session.execute(build_statement(batch_size))
+        rows = result.all() if audit_action else []
+        session.commit()
+        affected = len(rows) if audit_action else result.rowcount
+        total += affected
+        for row in rows:
+            audit_writer.record(audit_action, "booking", row[0], None, audit_details(row) if audit_details else None)
+        if affected < batch_size:
+            return total
+
+
+def expire_prebookings(session, batch_size: int) -> int:
+    """Cancel PREBOOKED holds that were never confirmed within the expiry window"""
+    cutoff = datetime.utcnow() - timedelta(hours=settings.PREBOOKING_EXPIRE_HOURS)
+
+    def build(limit):
+        stale = select(BookingDB.id).where(
+            BookingDB.booking_status == BookingStatus.PREBOOKED.value,
+            BookingDB.booking_date < cutoff
+        ).limit(limit).with_for_update(skip_locked=True)
+        return update(BookingDB).where(BookingDB.id.in_(stale)).values(
+            booking_status=BookingStatus.CANCELLED.value
+        ).returning(BookingDB.id).execution_options(synchronize_session=False)
+
+    return _run_batched(
+        session, build, batch_size, "expire",
+        lambda row: {"previous_status": BookingStatus.PREBOOKED.value}
+    )
+
+
+def mark_no_shows(session, batch_size: int) -> int:
+    """Mark bookings whose check-in date has passed without the guest arriving"""
+    cutoff = date.today() - timedelta(days=settings.NO_SHOW_GRACE_DAYS)
+
+    def build(limit):
+        missed = select(BookingDB.id).where(
+            BookingDB.booking_status.in_([
+                BookingStatus.PREBOOKED.value,
+                BookingStatus.CONFIRMED.value
+            ]),
+            BookingDB.actual_check_in.is_(None),
+            BookingDB.scheduled_check_in <= cutoff
+        ).limit(limit).with_for_update(skip_locked=True)
+        return update(BookingDB).where(BookingDB.id.in_(missed)).values(
+            booking_status=BookingStatus.NO_SHOW.value
+        ).returning(BookingDB.id).execution_options(synchronize_session=False)
+
+    return _run_batched(session, build, batch_size, "no_show")
+
+
+def apply_late_checkout_charges(session, batch_size: int) -> int:
+    """
+    Charge checked-in guests who stayed past their scheduled check-out.
+    The late fee owed so far is the number of overdue nights times the room rate.
+    late_checkout_charge records how much of it has already been billed, so each
+    run adds only the newly overdue nights on top of the booking's other charges.
+    """
+    today = date.today()
+    overdue_charge = cast(
+        (literal(today, Date) - BookingDB.scheduled_check_out)
+        * RoomDB.price_per_night
+        * settings.LATE_CHECKOUT_RATE_MULTIPLIER,
+        Numeric(10, 2)
+    )
+
+    def build(limit):
+        overdue = select(BookingDB.id).join(RoomDB, RoomDB.id == BookingDB.room_id).where(
+            BookingDB.booking_status == BookingStatus.CHECKED_IN.value,
+            BookingDB.scheduled_check_out < today,
+            BookingDB.late_checkout_charge < overdue_charge
+        ).limit(limit).with_for_update(of=BookingDB, skip_locked=True)
+        return update(BookingDB).where(
+            BookingDB.id.in_(overdue),
+            RoomDB.id == BookingDB.room_id
+        ).values(
+            # Both expressions see the row's values from before this UPDATE
+            additional_charges=BookingDB.additional_charges + overdue_charge - BookingDB.late_checkout_charge,
+            late_checkout_charge=overdue_charge
+        ).returning(
+            BookingDB.id, BookingDB.late_checkout_charge
+        ).execution_options(synchronize_session=False)
+
+    return _run_batched(
+        session, build, batch_size, "late_checkout_charge",
+        lambda row: {"late_checkout_charge": float(row.late_checkout_charge)}
+    )
+
+
+def purge_idempotency_keys(session, batch_size: int) -> int:
+    """Delete stored idempotent responses whose replay window has passed"""
+    now = datetime.utcnow()
+
+    def build(limit):
+        expired = select(IdempotencyKeyDB.scope, IdempotencyKeyDB.key).where(
+            IdempotencyKeyDB.expires_at <= now
+        ).limit(limit).with_for_update(skip_locked=True)
+        return delete(IdempotencyKeyDB).where(
+            tuple_(IdempotencyKeyDB.scope, IdempotencyKeyDB.key).in_(expired)
+        ).execution_options(synchronize_session=False)
+
+    return _run_batched(session, build, batch_size)
+
+
+class BackgroundScheduler:
+    """
+    Runs periodic maintenance jobs in a daemon thread.
+
+    Every worker process starts one, but only the worker holding the Postgres
+    advisory lock actually runs the jobs; the others keep trying to acquire it so
+    leadership moves over if the leader dies.
+    """
+
+    def __init__(self, jobs: List[Tuple[str, Callable]], interval_seconds: int, batch_size: int):
+        self.jobs = jobs
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.metrics: Dict[str, JobMetrics] = {name: JobMetrics() for name, _ in jobs}
+        self._lock_connection = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._lock_connection is not None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name="background-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self._release_leadership()
+
+    def _acquire_leadership(self) -> bool:
+        if self._lock_connection is not None:
+            try:
+                # Make sure the session holding the lock is still alive
+                self._lock_connection.execute(text("SELECT 1"))
+                self._lock_connection.commit()
+                return True
+            except Exception:
+                logger.warning("Scheduler lost its advisory lock connection")
+                self._release_leadership()
+
+        connection = engine.connect()
+        try:
+            acquired = connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": SCHEDULER_LOCK_KEY}
+            ).scalar()
+            connection.commit()
+        except Exception:
+            connection.close()
+            raise
+        if acquired:
+            self._lock_connection = connection
+            logger.info("Scheduler acquired leadership")
+            return True
+        connection.close()
+        return False
+
+    def _release_leadership(self):
+        if self._lock_connection is None:
+            return
+        try:
+            self._lock_connection.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": SCHEDULER_LOCK_KEY}
+            )
+            self._lock_connection.commit()
+            self._lock_connection.close()
+        except Exception:
+            # The lock may still be held; drop the server session instead of pooling it
+            self._lock_connection.invalidate()
+        finally:
+            self._lock_connection = None
+
+    def _loop(self):
+        while not self._stop_event.is_set():
+            try:
+                if self._acquire_leadership():
+                    self.run_jobs()
+            except Exception as e:
+                logger.error(f"Scheduler tick failed: {str(e)}")
+            self._stop_event.wait(self.interval_seconds)
+
+    def run_jobs(self):
+        for name, job in self.jobs:
+            if self._stop_event.is_set():
+                return
+            metrics = self.metrics[name]
+            started = time.perf_counter()
+            metrics.runs += 1
+            metrics.last_run_at = datetime.utcnow()
+            try:
+                with get_session() as session:
+                    rows = job(session, self.batch_size)
+                metrics.last_rows_affected = rows
+                metrics.rows_affected_total += rows
+                metrics.last_error = None
+            except Exception as e:
+                metrics.failures += 1
+                metrics.last_rows_affected = 0
+                metrics.last_error = str(e)
+                logger.error(f"Scheduler job {name} failed: {str(e)}")
+            finally:
+                metrics.last_duration_ms = (time.perf_counter() - started) * 1000
+            logger.info(
+                "Scheduler job %s updated %d rows in %.1f ms",
+                name, metrics.last_rows_affected, metrics.last_duration_ms
+            )
+
+    def get_metrics(self) -> Dict[str, dict]:
+        return {name: asdict(metrics) for name, metrics in self.metrics.items()}
+
+
+scheduler = BackgroundScheduler(
+    jobs=[
+        ("expire_prebookings", expire_prebookings),
+        ("mark_no_shows", mark_no_shows),
+        ("apply_late_checkout_charges", apply_late_checkout_charges),
+        ("purge_idempotency_keys", purge_idempotency_keys),
+    ],
+    interval_seconds=settings.SCHEDULER_INTERVAL_SECONDS,
+    batch_size=settings.SCHEDULER_BATCH_SIZE,
+)
@@ -36,12 +36,18 @@ CREATE TABLE IF NOT EXISTS bookings (
     total_amount DECIMAL(10,2) NOT NULL,
     amount_paid DECIMAL(10,2) NOT NULL DEFAULT 0,
     additional_charges DECIMAL(10,2) NOT NULL DEFAULT 0,
+    late_checkout_charge DECIMAL(10,2) NOT NULL DEFAULT 0,
     notes TEXT,
     
     booking_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Availability checks only look at active bookings
+CREATE INDEX IF NOT EXISTS ix_bookings_active_room_dates
+    ON bookings (room_id, scheduled_check_in, scheduled_check_out)
+    WHERE booking_status IN ('prebooked', 'confirmed', 'checked_in');
+
 -- Add trigger to automatically update updated_at
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$